@@ -2,18 +2,18 @@
 
 import json
 import os
-import shutil
+import stat
 import subprocess
-import tempfile
+import time
 import zipfile
 from pathlib import Path
 
+# Root directory of the project, assuming this script is in /scripts/.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-def get_project_root():
-    """
-    Returns the root directory of the project, assuming this script is in /scripts/.
-    """
-    return Path(__file__).resolve().parent.parent
+# DEFLATE level used for the packaged extension. The archive is built rarely
+# and downloaded often, so default to the smallest output.
+DEFAULT_ZIP_LEVEL = 9
 
 
 def extract_domains(config_path):
@@ -41,16 +41,17 @@ def update_manifest(
     manifest_in_path: Path,
     domains: list[str],
     version: str,
-    temp_manifest_path: Path,
-):
+) -> bytes:
     """
-    Updates the manifest.in.json with new domains and version, and saves as manifest.json.
+    Updates the manifest.in.json with new domains and version.
 
     Args:
         manifest_in_path (Path): Path to manifest.in.json.
         domains (list): List of domains to set in content_scripts.matches.
         version (str): Version string to set in manifest.
-        temp_manifest_path (Path): Path to save the updated manifest.json.
+
+    Returns:
+        bytes: Contents of the updated manifest.json.
     """
     try:
         with manifest_in_path.open("r", encoding="utf-8") as f:
@@ -74,15 +75,33 @@ def update_manifest(
         # Update version
         manifest["version"] = version
 
-        # Save to temp_manifest_path
-        with temp_manifest_path.open("w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2)
-
-        print(f"Updated manifest.json saved to {temp_manifest_path}")
+        print("Updated manifest.json")
+        return json.dumps(manifest, indent=2).encode("utf-8")
     except Exception as e:
         raise Exception(f"Error updating manifest: {e}") from e
 
 
+def get_zip_level() -> int:
+    """
+    Retrieves the DEFLATE compression level from SPECMONKEY_ZIP_LEVEL.
+
+    Returns:
+        int: Compression level between 0 and 9.
+    """
+    value = os.environ.get("SPECMONKEY_ZIP_LEVEL")
+    if value is None:
+        return DEFAULT_ZIP_LEVEL
+    try:
+        level = int(value)
+    except ValueError as e:
+        raise ValueError(
+            f"SPECMONKEY_ZIP_LEVEL must be an integer, got {value!r}."
+        ) from e
+    if not 0 <= level <= 9:
+        raise ValueError(f"SPECMONKEY_ZIP_LEVEL must be between 0 and 9, got {level}.")
+    return level
+
+
 def get_latest_git_tag() -> str:
     """
     Retrieves the latest Git tag.
@@ -104,30 +123,65 @@ def get_latest_git_tag() -> str:
         raise Exception(msg) from e
 
 
+def _scan_files(directory: str):
+    """
+    Recursively yields the files below a directory.
+
+    Args:
+        directory (str): Directory to scan.
+
+    Yields:
+        os.DirEntry: Entry for each file. Symlinked directories are not followed.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
 def create_zipfile(
     source_dir: Path,
-    manifest_path: Path,
+    manifest_data: bytes,
     output_zip_path: Path,
+    compresslevel: int = DEFAULT_ZIP_LEVEL,
 ) -> None:
     """
     Creates a ZIP archive of the extension.
 
     Args:
         source_dir (Path): Path to the /extension directory.
-        manifest_path (Path): Path to the updated manifest.json.
+        manifest_data (bytes): Contents of the updated manifest.json.
         output_zip_path (Path): Path to save the ZIP file.
+        compresslevel (int): DEFLATE compression level (0-9).
     """
     try:
-        with zipfile.ZipFile(output_zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(source_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(source_dir)
-                    if relative_path.name == "manifest.in.json":
-                        continue  # Exclude manifest.in.json
-                    zipf.write(file_path, arcname=relative_path)
+        with zipfile.ZipFile(
+            output_zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        ) as zipf:
+            for entry in _scan_files(str(source_dir)):
+                if entry.name == "manifest.in.json":
+                    continue  # Exclude manifest.in.json
+                arcname = os.path.relpath(entry.path, source_dir)
+                zinfo = zipfile.ZipInfo.from_file(entry.path, arcname=arcname)
+                with open(entry.path, "rb") as f:
+                    data = f.read()
+                zipf.writestr(
+                    zinfo,
+                    data,
+                    compress_type=zipf.compression,
+                    compresslevel=zipf.compresslevel,
+                )
             # Add the updated manifest.json
-            zipf.write(manifest_path, arcname="manifest.json")
+            zinfo = zipfile.ZipInfo("manifest.json", time.localtime()[:6])
+            zinfo.external_attr = (stat.S_IFREG | 0o644) << 16
+            zipf.writestr(
+                zinfo,
+                manifest_data,
+                compress_type=zipf.compression,
+                compresslevel=zipf.compresslevel,
+            )
         print(f"Extension packaged successfully at {output_zip_path}")
     except Exception as e:
         raise Exception(f"Error creating ZIP file: {e}") from e
@@ -135,13 +189,10 @@ def create_zipfile(
 
 def main():
     # Define paths
-    project_root = get_project_root()
-    extension_dir = project_root / "extension"
+    extension_dir = PROJECT_ROOT / "extension"
     config_path = extension_dir / "config.json"
     manifest_in_path = extension_dir / "manifest.in.json"
-    temp_dir = Path(tempfile.mkdtemp())
-    temp_manifest_path = temp_dir / "manifest.json"
-    output_dir = project_root / "dist"
+    output_dir = PROJECT_ROOT / "dist"
     output_dir.mkdir(exist_ok=True)
 
     # Step 1: Extract domains from config.json
@@ -152,19 +203,16 @@ def main():
     latest_tag = get_latest_git_tag()
     print(f"Latest Git tag: {latest_tag}")
 
-    # Step 3: Update manifest and save as manifest.json in temp_dir
-    update_manifest(manifest_in_path, domains, latest_tag, temp_manifest_path)
+    # Step 3: Update manifest
+    manifest_data = update_manifest(manifest_in_path, domains, latest_tag)
 
     # Step 4: Create ZIP archive
     # Define the output ZIP file name, e.g., specmonkey_v1.0.0.zip
     zip_filename = f"specmonkey_{latest_tag}.zip"
     output_zip_path = output_dir / zip_filename
 
-    create_zipfile(extension_dir, temp_manifest_path, output_zip_path)
-
-    # Clean up temp_dir
-    shutil.rmtree(temp_dir)
-    print(f"Temporary files cleaned up from {temp_dir}")
+    zip_level = get_zip_level()
+    create_zipfile(extension_dir, manifest_data, output_zip_path, zip_level)
 
 
 if __name__ == "__main__":